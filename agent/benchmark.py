@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the Dagger orchestrator.
+
+Runs DaggerOrchestrator against the in-process fakes in fakes.py, so the
+scheduling overhead and concurrency of a deployment can be measured without a
+Docker daemon, a Dagger engine or network access. Results are written as JSON
+and can be compared against a saved baseline.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import types
+from dataclasses import asdict
+
+import fakes
+
+STAGES = [
+    "prefetch_images",
+    "deploy_database",
+    "deploy_replicas",
+    "deploy_api",
+    "deploy_frontend",
+    "perform_health_checks",
+]
+
+# Metrics checked against a baseline, with the absolute slack allowed on top
+# of the relative threshold so near-zero values don't flag noise
+COMPARED_METRICS = {
+    "deploy_seconds": 0.01,
+    "teardown_seconds": 0.01,
+    "loop_blocked_ms": 5.0,
+    "loop_max_lag_ms": 5.0,
+}
+
+
+def load_orchestrator_module():
+    """Import main.py with the fakes standing in for the dagger and docker SDKs"""
+    saved = {name: sys.modules.get(name) for name in ("dagger", "docker")}
+    sys.modules["dagger"] = types.ModuleType("dagger")
+    sys.modules["docker"] = types.ModuleType("docker")
+    try:
+        import main
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return main
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a periodic task"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - start - self.interval, 0.0))
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+    def summary(self) -> dict:
+        samples = sorted(self.samples) or [0.0]
+        return {
+            "loop_max_lag_ms": samples[-1] * 1000,
+            "loop_p99_lag_ms": samples[min(int(len(samples) * 0.99), len(samples) - 1)] * 1000,
+            "loop_blocked_ms": sum(samples) * 1000,
+        }
+
+
+def time_stages(orchestrator, timings: dict):
+    """Wrap the orchestrator's deployment stages to record how long each takes"""
+    for name in STAGES:
+        method = getattr(orchestrator, name)
+
+        async def timed(*args, _method=method, _name=name, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await _method(*args, **kwargs)
+            finally:
+                timings[_name] = time.perf_counter() - start
+
+        setattr(orchestrator, name, timed)
+
+
+async def run_once(main, args, latencies: fakes.Latencies) -> dict:
+    """Deploy and tear down args.stacks stacks concurrently against a cold fake engine"""
+    engine = fakes.FakeEngine(latencies)
+    main.dagger = fakes.dagger_module(engine)
+    main.docker = fakes.docker_module(latencies, engine.registry)
+
+    orchestrators = []
+    stage_timings = []
+    for _ in range(args.stacks):
+        orchestrator = main.DaggerOrchestrator(args.project_dir)
+        orchestrator.config.setdefault("healthcheck", {})["initial_delay"] = args.initial_delay
+        # Concurrent stacks each need their own API proxy port
+        orchestrator.config["api"]["host_port"] = 0
+        orchestrator.config["db"].setdefault("replicas", {}).update({
+            "count": args.replicas,
+            "user": "replicator",
+            "password": "replicator",
+        })
+        timings = {}
+        time_stages(orchestrator, timings)
+        orchestrators.append(orchestrator)
+        stage_timings.append(timings)
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(o.deploy() for o in orchestrators))
+    deploy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(o.close() for o in orchestrators))
+    teardown_seconds = time.perf_counter() - start
+
+    await monitor.stop()
+
+    return {
+        "deploy_seconds": deploy_seconds,
+        "teardown_seconds": teardown_seconds,
+        "health_checks_passed": all(results),
+        "stages": {
+            name: statistics.mean(t.get(name, 0.0) for t in stage_timings)
+            for name in STAGES
+        },
+        "engine": dict(engine.counts),
+        **monitor.summary(),
+    }
+
+
+def summarize(runs: list) -> dict:
+    """Median, min and max of each numeric metric across runs"""
+    summary = {}
+    for metric in ["deploy_seconds", "teardown_seconds", "loop_max_lag_ms", "loop_p99_lag_ms", "loop_blocked_ms"]:
+        values = [run[metric] for run in runs]
+        summary[metric] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+    return summary
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return descriptions of metrics whose median regressed beyond the threshold"""
+    regressions = []
+    for metric, slack in COMPARED_METRICS.items():
+        if metric not in baseline.get("summary", {}):
+            continue
+        current = results["summary"][metric]["median"]
+        previous = baseline["summary"][metric]["median"]
+        limit = previous * (1 + threshold / 100) + slack
+        status = "❌" if current > limit else "✅"
+        print(f"  {status} {metric}: {previous:.4f} -> {current:.4f} (limit {limit:.4f})")
+        if current > limit:
+            regressions.append(metric)
+    return regressions
+
+
+def git_commit(project_dir: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def run_benchmark(args) -> dict:
+    main = load_orchestrator_module()
+    latencies = fakes.Latencies(
+        pull=args.pull,
+        build=args.build,
+        publish=args.publish,
+        health=args.health,
+        start=args.start,
+        stop=args.stop,
+        docker_api=args.docker_latency,
+    )
+
+    runs = []
+    for iteration in range(args.repeat):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            run = await run_once(main, args, latencies)
+        runs.append(run)
+        print(f"  ⏱️ Run {iteration + 1}/{args.repeat}: deploy {run['deploy_seconds']:.3f}s, "
+              f"teardown {run['teardown_seconds']:.3f}s, max loop lag {run['loop_max_lag_ms']:.1f}ms")
+
+    return {
+        "commit": git_commit(args.project_dir),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {
+            "stacks": args.stacks,
+            "replicas": args.replicas,
+            "repeat": args.repeat,
+            "initial_delay": args.initial_delay,
+            "latencies": asdict(latencies),
+        },
+        "runs": runs,
+        "summary": summarize(runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for the Dagger orchestrator")
+    parser.add_argument("--project-dir", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), help="Project directory path")
+    parser.add_argument("--stacks", type=int, default=1, help="Number of stacks deployed concurrently")
+    parser.add_argument("--replicas", type=int, default=0, help="Read replicas per stack")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measured runs")
+    parser.add_argument("--pull", type=float, default=0.5, help="Simulated image pull latency (s)")
+    parser.add_argument("--build", type=float, default=0.2, help="Simulated build step latency (s)")
+    parser.add_argument("--publish", type=float, default=0.1, help="Simulated publish latency (s)")
+    parser.add_argument("--health", type=float, default=0.05, help="Simulated health check latency (s)")
+    parser.add_argument("--start", type=float, default=0.05, help="Simulated service start latency, e.g. replica clone time (s)")
+    parser.add_argument("--stop", type=float, default=0.02, help="Simulated service stop latency (s)")
+    parser.add_argument("--docker-latency", type=float, default=0.01, help="Simulated blocking Docker API call latency (s)")
+    parser.add_argument("--initial-delay", type=float, default=0.0, help="Health check initial delay (s)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed regression over the baseline (%%)")
+    parser.add_argument("--verbose", action="store_true", help="Show orchestrator output")
+    args = parser.parse_args()
+
+    print(f"🏁 Benchmarking {args.stacks} stack(s) x {args.repeat} run(s) against fake backends...")
+    results = asyncio.run(run_benchmark(args))
+
+    summary = results["summary"]
+    print("\n📊 Median results:")
+    print(f"  • Deploy: {summary['deploy_seconds']['median']:.3f}s")
+    print(f"  • Teardown: {summary['teardown_seconds']['median']:.3f}s")
+    print(f"  • Event loop blocked: {summary['loop_blocked_ms']['median']:.1f}ms "
+          f"(max lag {summary['loop_max_lag_ms']['median']:.1f}ms)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        print(f"\n🔍 Comparing against {args.compare} (commit {baseline.get('commit', 'unknown')}):")
+        if baseline.get("params") != results["params"]:
+            print("  ⚠️ Baseline was recorded with different parameters")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Regressions: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+In-process fakes for the Dagger and Docker SDKs used by the benchmark harness.
+
+The fakes simulate latency instead of doing work: Dagger operations await
+asyncio.sleep like the real async SDK, while Docker calls block with
+time.sleep like the real synchronous docker-py client. A shared FakeEngine
+models the Dagger engine cache, so repeated pulls and builds are cheap and
+services with identical definitions share one running instance.
+"""
+
+import asyncio
+import hashlib
+import time
+import types
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Latencies:
+    """Simulated latencies in seconds"""
+    pull: float = 0.5
+    build: float = 0.2
+    publish: float = 0.1
+    health: float = 0.05
+    start: float = 0.05
+    stop: float = 0.02
+    docker_api: float = 0.01
+
+
+class FakeRegistry:
+    """Stand-in for an image registry that counts how often it is contacted"""
+
+    def __init__(self):
+        self.contacts = 0
+        # Repositories whose pulls fail, as if missing from the registry
+        self.unavailable = set()
+
+    @staticmethod
+    def repository(address: str) -> str:
+        """Tag reference with any pinned digest stripped"""
+        return address.split("@")[0]
+
+    def digest_ref(self, address: str) -> str:
+        repository = self.repository(address)
+        return f"{repository}@sha256:{hashlib.sha256(repository.encode()).hexdigest()}"
+
+
+class FakeEngine:
+    """Shared state of a simulated Dagger engine and its cache"""
+
+    def __init__(self, latencies: Latencies, registry: Optional[FakeRegistry] = None):
+        self.latencies = latencies
+        self.registry = registry or FakeRegistry()
+        self.pulls: Dict[str, asyncio.Future] = {}
+        self.builds: Dict[tuple, asyncio.Future] = {}
+        self.services: Dict[tuple, asyncio.Future] = {}
+        self.counts = {"pull": 0, "build": 0, "publish": 0, "health": 0, "service_start": 0}
+
+    async def _once(self, cache: Dict, key, delay: float, kind: str):
+        """Run a simulated operation once per key; concurrent callers share it"""
+        if key not in cache:
+            cache[key] = asyncio.ensure_future(asyncio.sleep(delay))
+            self.counts[kind] += 1
+        await asyncio.shield(cache[key])
+
+    async def start_service(self, service: "FakeService"):
+        """Start a service unless an identically defined one is already running"""
+        if service.key not in self.services:
+            self.services[service.key] = asyncio.ensure_future(service._run())
+        await asyncio.shield(self.services[service.key])
+
+    async def stop_service(self, service: "FakeService"):
+        """Stop the instance running a service's definition, if any"""
+        if self.services.pop(service.key, None) is not None:
+            await asyncio.sleep(self.latencies.stop)
+
+    def is_running(self, service: "FakeService") -> bool:
+        return service.key in self.services
+
+    async def evaluate(self, ops: tuple, bindings: tuple = ()):
+        """Evaluate a container pipeline, starting bound services and pulling and building uncached steps"""
+        # Like Dagger, bound services are started (once each) before the pipeline runs
+        await asyncio.gather(*(service.start() for service in bindings))
+        for index, (name, args) in enumerate(ops):
+            if name == "from_":
+                repository = self.registry.repository(args[0])
+                # Tags are resolved against the registry; pinned digests are not
+                if "@sha256:" not in args[0]:
+                    self.registry.contacts += 1
+                if repository not in self.pulls:
+                    self.registry.contacts += 1
+                    if repository in self.registry.unavailable:
+                        raise RuntimeError(f"pull access denied for {repository}")
+                await self._once(self.pulls, repository, self.latencies.pull, "pull")
+            elif name == "with_exec" and args and args[0][0] == "curl":
+                self.counts["health"] += 1
+                await asyncio.sleep(self.latencies.health)
+            elif name == "with_exec":
+                await self._once(self.builds, ops[:index + 1], self.latencies.build, "build")
+
+
+class FakeDirectory:
+    def directory(self, path: str) -> "FakeDirectory":
+        return self
+
+
+class FakeHost:
+    def __init__(self, engine: "FakeEngine"):
+        self.engine = engine
+
+    def directory(self, path: str, exclude: Optional[List[str]] = None) -> FakeDirectory:
+        return FakeDirectory()
+
+    def tunnel(self, service: "FakeService", **kwargs) -> "FakeTunnel":
+        return FakeTunnel(self.engine, service)
+
+
+class FakePublished:
+    """Published container, exposing the ID the orchestrator maps host ports with"""
+
+    def __init__(self, container_id: str):
+        self.id = container_id
+
+
+class FakeService:
+    """Service handle; like Dagger, its identity is its definition, not the object"""
+
+    def __init__(self, engine: FakeEngine, ops: tuple, bindings: tuple = ()):
+        self.engine = engine
+        self.ops = ops
+        self.bindings = bindings
+
+    @property
+    def key(self) -> tuple:
+        """Stand-in for the definition digest, covering the bound services too"""
+        return self.ops, tuple(service.key for service in self.bindings)
+
+    def with_exposed_port(self, port: int) -> "FakeService":
+        return self
+
+    async def _run(self):
+        # The final exec is the long-running service command, not a build step
+        build_ops = self.ops[:-1] if self.ops and self.ops[-1][0] == "with_exec" else self.ops
+        await self.engine.evaluate(build_ops, self.bindings)
+        self.engine.counts["service_start"] += 1
+        await asyncio.sleep(self.engine.latencies.start)
+
+    async def start(self) -> "FakeService":
+        await self.engine.start_service(self)
+        return self
+
+    async def stop(self) -> "FakeService":
+        await self.engine.stop_service(self)
+        return self
+
+
+class FakeTunnel:
+    """Host tunnel to a service; nothing listens on its endpoint"""
+
+    def __init__(self, engine: FakeEngine, service: FakeService):
+        self.engine = engine
+        self.service = service
+
+    async def start(self) -> "FakeTunnel":
+        await self.service.start()
+        return self
+
+    async def stop(self) -> "FakeTunnel":
+        await asyncio.sleep(self.engine.latencies.stop)
+        return self
+
+    async def endpoint(self, **kwargs) -> str:
+        # One port per service definition, like a tunnel to its single instance
+        digest = hashlib.sha256(repr(self.service.key).encode()).digest()
+        return f"localhost:{1024 + int.from_bytes(digest[:2], 'big') % 60000}"
+
+
+class FakeContainer:
+    """Immutable container pipeline that records its operations"""
+
+    def __init__(self, engine: FakeEngine, ops: tuple = (), bindings: tuple = ()):
+        self.engine = engine
+        self.ops = ops
+        self.bindings = bindings
+
+    def _with(self, name: str, *args) -> "FakeContainer":
+        return FakeContainer(self.engine, self.ops + ((name, args),), self.bindings)
+
+    def from_(self, address: str) -> "FakeContainer":
+        return self._with("from_", address)
+
+    def with_exec(self, args: List[str], **kwargs) -> "FakeContainer":
+        return self._with("with_exec", tuple(args))
+
+    def with_env_variable(self, name: str, value: str) -> "FakeContainer":
+        return self._with("with_env_variable", name, value)
+
+    def with_directory(self, path: str, directory: FakeDirectory) -> "FakeContainer":
+        return self._with("with_directory", path)
+
+    def with_new_file(self, path: str, contents: str = "", **kwargs) -> "FakeContainer":
+        return self._with("with_new_file", path, contents)
+
+    def with_default_args(self, args: Optional[List[str]] = None) -> "FakeContainer":
+        return self._with("with_default_args", tuple(args or ()))
+
+    def with_workdir(self, path: str) -> "FakeContainer":
+        return self._with("with_workdir", path)
+
+    def with_user(self, name: str) -> "FakeContainer":
+        return self._with("with_user", name)
+
+    def with_service_binding(self, alias: str, service: FakeService) -> "FakeContainer":
+        container = self._with("with_service_binding", alias)
+        container.bindings = self.bindings + (service,)
+        return container
+
+    def with_exposed_port(self, port: int) -> "FakeContainer":
+        return self
+
+    def as_service(self) -> FakeService:
+        return FakeService(self.engine, self.ops, self.bindings)
+
+    async def sync(self) -> "FakeContainer":
+        await self.engine.evaluate(self.ops, self.bindings)
+        return self
+
+    async def image_ref(self) -> str:
+        return self.engine.registry.digest_ref(self.ops[0][1][0])
+
+    async def stdout(self) -> str:
+        await self.engine.evaluate(self.ops, self.bindings)
+        return "ok"
+
+    async def publish(self, address: str = "") -> FakePublished:
+        await self.engine.evaluate(self.ops, self.bindings)
+        self.engine.counts["publish"] += 1
+        await asyncio.sleep(self.engine.latencies.publish)
+        return FakePublished(hashlib.sha256(repr(self.ops).encode()).hexdigest()[:12])
+
+
+class FakeClient:
+    def __init__(self, engine: FakeEngine):
+        self.engine = engine
+
+    def host(self) -> FakeHost:
+        return FakeHost(self.engine)
+
+    def container(self) -> FakeContainer:
+        return FakeContainer(self.engine)
+
+
+class FakeConnection:
+    def __init__(self, engine: FakeEngine):
+        self.engine = engine
+
+    async def __aenter__(self) -> FakeClient:
+        return FakeClient(self.engine)
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+class _Blocking:
+    """Base for docker-py fakes; every call blocks the calling thread"""
+
+    def __init__(self, latencies: Latencies):
+        self.latencies = latencies
+
+    def _call(self, delay: Optional[float] = None):
+        time.sleep(self.latencies.docker_api if delay is None else delay)
+
+
+class FakeDockerContainer(_Blocking):
+    def __init__(self, latencies: Latencies, container_id: str):
+        super().__init__(latencies)
+        self.id = container_id
+
+    def stop(self):
+        self._call(self.latencies.stop)
+
+    def remove(self):
+        self._call()
+
+
+class FakeContainers(_Blocking):
+    def get(self, container_id: str) -> FakeDockerContainer:
+        self._call()
+        return FakeDockerContainer(self.latencies, container_id)
+
+    def run(self, image: str, command: str, **kwargs) -> bytes:
+        self._call(self.latencies.health)
+        return b"ok"
+
+
+class FakeNetworks(_Blocking):
+    def list(self, names: Optional[List[str]] = None) -> list:
+        self._call()
+        return ["network"]
+
+    def create(self, name: str, **kwargs):
+        self._call()
+
+
+class ImageNotFound(Exception):
+    pass
+
+
+class FakeImages(_Blocking):
+    def __init__(self, latencies: Latencies, registry: FakeRegistry, local_images: set):
+        super().__init__(latencies)
+        self.registry = registry
+        self.local_images = local_images
+
+    def get(self, name: str) -> str:
+        self._call()
+        if FakeRegistry.repository(name) not in self.local_images:
+            raise ImageNotFound(name)
+        return name
+
+    def pull(self, repository: str, **kwargs):
+        self._call(self.latencies.pull)
+        self.registry.contacts += 1
+        self.local_images.add(FakeRegistry.repository(repository))
+
+
+class FakeAPIClient(_Blocking):
+    def create_host_config(self, **kwargs) -> dict:
+        return kwargs
+
+    def update_container(self, container_id: str, **kwargs):
+        self._call()
+
+
+class FakeDockerClient(_Blocking):
+    def __init__(self, latencies: Latencies, registry: FakeRegistry, local_images: set):
+        super().__init__(latencies)
+        self.containers = FakeContainers(latencies)
+        self.networks = FakeNetworks(latencies)
+        self.images = FakeImages(latencies, registry, local_images)
+        self.api = FakeAPIClient(latencies)
+
+    def ping(self) -> bool:
+        self._call()
+        return True
+
+    def info(self) -> dict:
+        self._call()
+        return {"MemTotal": 8 * 1024 ** 3, "NCPU": 4}
+
+
+def dagger_module(engine: FakeEngine) -> types.ModuleType:
+    """Module standing in for `dagger`, backed by the given engine"""
+    module = types.ModuleType("dagger")
+    module.Connection = lambda *args, **kwargs: FakeConnection(engine)
+    return module
+
+
+def docker_module(latencies: Latencies, registry: Optional[FakeRegistry] = None) -> types.ModuleType:
+    """Module standing in for `docker`; its clients share one local image store"""
+    registry = registry or FakeRegistry()
+    local_images = set()
+    module = types.ModuleType("docker")
+    module.from_env = lambda *args, **kwargs: FakeDockerClient(latencies, registry, local_images)
+    module.errors = types.SimpleNamespace(ImageNotFound=ImageNotFound)
+    return module
@@ -4,8 +4,23 @@ import sys
 import time
 import os
 import json
+import signal
 import argparse
 import docker
+from tuning import (
+    PG_STAT_STATEMENTS_INIT_SQL,
+    TOP_QUERIES_SQL,
+    build_postgres_settings,
+    settings_to_args,
+)
+from proxy import ApiProxy, parse_endpoint
+from replication import (
+    primary_init_script,
+    primary_settings,
+    replica_command,
+    replica_host,
+    replica_slot,
+)
 
 class DaggerOrchestrator:
     """
@@ -14,13 +29,20 @@ class DaggerOrchestrator:
     across separate containers.
     """
     
-    def __init__(self, project_dir="."):
+    def __init__(self, project_dir=".", update_lock=False):
         self.project_dir = project_dir
+        self.update_lock = update_lock
+        self.connection = None
         self.client = None
         self.db_service = None
+        self.db_settings = {}
+        self.replica_services = []
         self.api_service = None
         self.frontend_service = None
+        self.api_tunnel = None
+        self.api_proxy = None
         self.config = self._load_config()
+        self.image_lock = self._load_image_lock()
         self.docker_client = None
         self.container_ids = {}
         self._verify_docker_access()
@@ -49,13 +71,37 @@ class DaggerOrchestrator:
                 },
                 "port": 5432,
                 "host_port": 5432,
-                "network": "app-network"
+                "network": "app-network",
+                "tuning": {
+                    "enabled": True,
+                    "profile": "default",
+                    "memory_mb": None,
+                    "cpus": None,
+                    "max_connections": 100,
+                    "pg_stat_statements": True,
+                    "top_queries": 10,
+                    "settings": {}
+                },
+                "replicas": {
+                    "count": 0,
+                    "user": "replicator",
+                    "password": "replicator",
+                    "max_lag_seconds": 5,
+                    "health_ttl_seconds": 1
+                }
             },
             "api": {
                 "image": "python:3.11-slim",
                 "port": 5000,
                 "host_port": 5000,
-                "network": "app-network"
+                "network": "app-network",
+                "workers": 2,
+                "update": {
+                    "strategy": "rolling",
+                    "readiness_timeout": 60,
+                    "readiness_interval": 1,
+                    "drain_seconds": 10
+                }
             },
             "frontend": {
                 "image": "node:20-alpine",
@@ -63,6 +109,14 @@ class DaggerOrchestrator:
                 "host_port": 3001,
                 "network": "app-network"
             },
+            "healthcheck": {
+                "image": "alpine/curl",
+                "initial_delay": 5
+            },
+            "prefetch": {
+                "enabled": True,
+                "lockfile": "images.lock.json"
+            },
             "registry": {
                 "default_registry": "docker.io",
                 "tag_prefix": "ai-agent-demo",
@@ -79,9 +133,100 @@ class DaggerOrchestrator:
                 return default_config
         return default_config
     
+    def _lockfile_path(self):
+        """Path of the image lockfile that pins base image tags to digests"""
+        lockfile = self.config.get("prefetch", {}).get("lockfile", "images.lock.json")
+        # Relative to this file so the lockfile lands in agent/ from any working directory
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), lockfile)
+    
+    def _load_image_lock(self):
+        """Load pinned image references from the lockfile if it exists"""
+        lock_path = self._lockfile_path()
+        if self.update_lock or not os.path.exists(lock_path):
+            return {}
+        try:
+            with open(lock_path, 'r') as f:
+                image_lock = json.load(f)
+            print(f"📌 Using {len(image_lock)} pinned images from {lock_path}")
+            return image_lock
+        except Exception as e:
+            print(f"⚠️ Error loading image lockfile: {str(e)}. Using tags.")
+            return {}
+    
+    def _image(self, ref):
+        """Resolve an image tag to its pinned digest reference when locked"""
+        return self.image_lock.get(ref, ref)
+    
+    def _base_images(self):
+        """All base images named in the configuration, without duplicates"""
+        images = [
+            self.config["db"]["image"],
+            self.config["api"]["image"],
+            self.config["frontend"]["image"],
+            self.config.get("healthcheck", {}).get("image", "alpine/curl"),
+        ]
+        return list(dict.fromkeys(images))
+    
+    async def _pull_image(self, ref):
+        """Pull an image into the Dagger engine cache and return its digest reference"""
+        container = self.client.container().from_(self._image(ref))
+        await container.sync()
+        return await container.image_ref()
+    
+    def _ensure_local_image(self, ref):
+        """Pull an image into the Docker daemon only if it is not already present"""
+        try:
+            self.docker_client.images.get(ref)
+            return False
+        except docker.errors.ImageNotFound:
+            self.docker_client.images.pull(ref)
+            return True
+    
+    async def prefetch_images(self):
+        """Pull all base images concurrently before any service is deployed"""
+        if not self.config.get("prefetch", {}).get("enabled", True):
+            return {}
+        
+        images = self._base_images()
+        print(f"📥 Prefetching {len(images)} base images...")
+        health_image = self._image(self.config.get("healthcheck", {}).get("image", "alpine/curl"))
+        *results, health_result = await asyncio.gather(
+            *(self._pull_image(ref) for ref in images),
+            # The host health check runs through the Docker daemon, not Dagger
+            asyncio.to_thread(self._ensure_local_image, health_image),
+            return_exceptions=True
+        )
+        
+        pinned = {}
+        for ref, result in zip(images, results):
+            if isinstance(result, Exception):
+                print(f"  ⚠️ Failed to prefetch {ref}: {str(result)}")
+            else:
+                pinned[ref] = result
+                print(f"  ✅ {ref} -> {result}")
+        
+        if isinstance(health_result, Exception):
+            print(f"  ⚠️ Failed to pull {health_image} into Docker: {str(health_result)}")
+        elif health_result:
+            print(f"  ✅ Pulled {health_image} into Docker")
+        
+        if self.update_lock:
+            failed = [ref for ref in images if ref not in pinned]
+            if failed:
+                # A partial lockfile would silently send later runs back to the registry
+                raise RuntimeError(f"Not updating the image lockfile; failed to resolve {', '.join(failed)}")
+            lock_path = self._lockfile_path()
+            with open(lock_path, 'w') as f:
+                json.dump(pinned, f, indent=2)
+            self.image_lock = pinned
+            print(f"📌 Wrote {len(pinned)} pinned images to {lock_path}")
+        
+        return pinned
+    
     async def initialize_client(self):
         """Initialize the Dagger client"""
-        self.client = await dagger.Connection().__aenter__()
+        self.connection = dagger.Connection()
+        self.client = await self.connection.__aenter__()
         return self.client
     
     async def setup_project_directory(self):
@@ -115,7 +260,7 @@ class DaggerOrchestrator:
         
         db = (
             self.client.container()
-            .from_(db_config["image"])
+            .from_(self._image(db_config["image"]))
         )
         
         # Add environment variables
@@ -125,6 +270,34 @@ class DaggerOrchestrator:
         # Add initialization scripts
         db = db.with_directory("/docker-entrypoint-initdb.d", project_dir.directory("db"))
         
+        # Apply host-aware server settings
+        settings = {}
+        tuning_config = db_config.get("tuning", {})
+        if tuning_config.get("enabled", False):
+            settings = self._postgres_settings(tuning_config)
+            if tuning_config.get("pg_stat_statements", True):
+                db = db.with_new_file(
+                    "/docker-entrypoint-initdb.d/00-pg-stat-statements.sql",
+                    contents=PG_STAT_STATEMENTS_INIT_SQL
+                )
+            print(f"  ⚙️ Applied {tuning_config.get('profile', 'default')} tuning profile: "
+                  f"shared_buffers={settings['shared_buffers']}, work_mem={settings['work_mem']}, "
+                  f"effective_cache_size={settings['effective_cache_size']}")
+        
+        # Enable WAL streaming for read replicas
+        replica_config = db_config.get("replicas", {})
+        if replica_config.get("count", 0) > 0:
+            settings.update(primary_settings(replica_config["count"]))
+            db = db.with_new_file(
+                "/docker-entrypoint-initdb.d/01-replication.sh",
+                contents=primary_init_script(replica_config["user"], replica_config["password"]),
+                permissions=0o755
+            )
+        
+        self.db_settings = settings
+        if settings:
+            db = db.with_default_args(args=settings_to_args(settings))
+        
         # Create service with exposed port
         self.db_service = db.as_service().with_exposed_port(db_config["port"])
         
@@ -150,72 +323,162 @@ class DaggerOrchestrator:
         
         return self.db_service
     
-    async def deploy_api(self, project_dir):
-        """Deploy the Flask API container"""
-        print("🐍 Setting up Flask API...")
+    async def deploy_replicas(self):
+        """Deploy streaming read replicas of the primary database"""
+        db_config = self.config["db"]
+        replica_config = db_config.get("replicas", {})
+        count = replica_config.get("count", 0)
+        if count <= 0:
+            return self.replica_services
+        
+        print(f"🛢️ Setting up {count} PostgreSQL read replica(s)...")
+        server_args = settings_to_args(self.db_settings)
+        for index in range(count):
+            command = replica_command(index, replica_config["user"], db_config["port"], server_args)
+            replica = (
+                self.client.container()
+                .from_(self._image(db_config["image"]))
+                .with_service_binding("db", self.db_service)
+                .with_env_variable("PGPASSWORD", replica_config["password"])
+                .with_user("postgres")
+                .with_exec(command)
+                .as_service()
+                .with_exposed_port(db_config["port"])
+            )
+            self.replica_services.append(replica)
+            print(f"  ✅ Replica {replica_host(index)} streaming from db (slot {replica_slot(index)})")
+        
+        return self.replica_services
+    
+    def _postgres_settings(self, tuning_config):
+        """Build per-instance Postgres settings from configured limits, falling back to host resources"""
+        memory_mb = tuning_config.get("memory_mb")
+        cpus = tuning_config.get("cpus")
+        if not memory_mb or not cpus:
+            try:
+                info = self.docker_client.info()
+                memory_mb = memory_mb or info["MemTotal"] // (1024 * 1024)
+                cpus = cpus or info["NCPU"]
+            except Exception as e:
+                print(f"  ⚠️ Could not read host resources, assuming 1GB/1 CPU: {str(e)}")
+                memory_mb = memory_mb or 1024
+                cpus = cpus or 1
+        
+        # The primary and its replicas share the memory budget, so size each instance for its slice
+        instances = 1 + max(self.config["db"].get("replicas", {}).get("count", 0), 0)
+        if instances > 1:
+            print(f"  ⚙️ Splitting {memory_mb}MB across the primary and {instances - 1} replica(s)")
+        memory_bytes = int(memory_mb) * 1024 * 1024 // instances
+        return build_postgres_settings(tuning_config, memory_bytes, int(cpus))
+    
+    def _build_api(self, project_dir):
+        """Build the API container and the service that serves it"""
         api_config = self.config["api"]
+        update_config = api_config.get("update", {})
         
         api = (
             self.client.container()
-            .from_(api_config["image"])
+            .from_(self._image(api_config["image"]))
             .with_directory("/app", project_dir.directory("api"))
             .with_workdir("/app")
             .with_exec(["pip", "install", "-r", "requirements.txt"])
         )
         
-        self.api_service = (
-            api.with_service_binding("db", self.db_service)
+        db_env = self.config["db"]["env"]
+        db_port = self.config["db"]["port"]
+        replica_config = self.config["db"].get("replicas", {})
+        
+        api_with_db = api.with_service_binding("db", self.db_service)
+        replica_urls = []
+        for index, replica_service in enumerate(self.replica_services):
+            host = replica_host(index)
+            api_with_db = api_with_db.with_service_binding(host, replica_service)
+            replica_urls.append(f"postgresql://{db_env['POSTGRES_USER']}:{db_env['POSTGRES_PASSWORD']}@{host}:{db_port}/{db_env['POSTGRES_DB']}")
+        
+        # Gunicorn finishes in-flight requests on SIGTERM, which lets a rolling
+        # update drain the old instance instead of dropping its connections
+        api_service = (
+            api_with_db
             .with_env_variable("FLASK_APP", "app.py")
-            .with_env_variable("DATABASE_URL", f"postgresql://{self.config['db']['env']['POSTGRES_USER']}:{self.config['db']['env']['POSTGRES_PASSWORD']}@db:{self.config['db']['port']}/{self.config['db']['env']['POSTGRES_DB']}")
-            .with_exec(["flask", "run", "--host=0.0.0.0"])
+            .with_env_variable("DATABASE_URL", f"postgresql://{db_env['POSTGRES_USER']}:{db_env['POSTGRES_PASSWORD']}@db:{db_port}/{db_env['POSTGRES_DB']}")
+            .with_env_variable("DATABASE_REPLICA_URLS", ",".join(replica_urls))
+            .with_env_variable("REPLICA_MAX_LAG_SECONDS", str(replica_config.get("max_lag_seconds", 5)))
+            .with_env_variable("REPLICA_HEALTH_TTL_SECONDS", str(replica_config.get("health_ttl_seconds", 1)))
+            # Dagger runs one instance per service definition; a unique revision
+            # makes a redeploy start a new instance even when api/ is unchanged
+            .with_env_variable("API_REVISION", str(time.time_ns()))
+            .with_exec([
+                "gunicorn",
+                "--bind", f"0.0.0.0:{api_config['port']}",
+                "--workers", str(api_config.get("workers", 2)),
+                "--graceful-timeout", str(update_config.get("drain_seconds", 10)),
+                "app:app"
+            ])
             .as_service()
             .with_exposed_port(api_config["port"])
         )
+        return api, api_service
+    
+    async def deploy_api(self, project_dir):
+        """Deploy the Flask API container"""
+        print("🐍 Setting up Flask API...")
+        api_config = self.config["api"]
         
-        # Get container ID for host port mapping
+        api, self.api_service = self._build_api(project_dir)
+        await self.api_service.start()
+        
+        # Get container ID for export and cleanup
         api_container = await api.with_service_binding("db", self.db_service).with_exposed_port(api_config["port"]).publish()
         api_container_id = api_container.id
         self.container_ids["api"] = api_container_id
         
-        # Map container port to host port
-        try:
-            container = self.docker_client.containers.get(api_container_id)
-            host_config = self.docker_client.api.create_host_config(
-                port_bindings={api_config["port"]: api_config["host_port"]},
-                network_mode=api_config["network"]
-            )
-            self.docker_client.api.update_container(
-                container.id,
-                host_config=host_config
-            )
-            print(f"✅ API container exposed on host port {api_config['host_port']}")
-        except Exception as e:
-            print(f"⚠️ Failed to map API port to host: {str(e)}")
+        # Clients reach the API through a proxy on the host port, which lets a
+        # rolling update move traffic to a new instance without a gap
+        self.api_tunnel, upstream = await self._tunnel_api(self.api_service)
+        self.api_proxy = ApiProxy(api_config["host_port"], upstream)
+        await self.api_proxy.start()
+        print(f"✅ API exposed on host port {self.api_proxy.port}")
         
         return self.api_service
     
-    async def deploy_frontend(self, project_dir):
-        """Deploy the React frontend container"""
-        print("⚛️ Setting up React frontend...")
+    async def _tunnel_api(self, api_service):
+        """Tunnel an API service to a host port and return the tunnel and its upstream address"""
+        tunnel = self.client.host().tunnel(api_service)
+        await tunnel.start()
+        return tunnel, parse_endpoint(await tunnel.endpoint())
+    
+    def _build_frontend(self, project_dir, api_service):
+        """Build the frontend container and the service bound to the given API"""
         frontend_config = self.config["frontend"]
         
         frontend = (
             self.client.container()
-            .from_(frontend_config["image"])
+            .from_(self._image(frontend_config["image"]))
             .with_directory("/app", project_dir.directory("frontend"))
             .with_workdir("/app")
             .with_exec(["npm", "install"])
+            # serve does not proxy /api, so the browser calls the API proxy on the host port
+            .with_env_variable("REACT_APP_API_URL", f"http://localhost:{self.api_proxy.port}")
             .with_exec(["npm", "run", "build"])
             .with_exec(["npm", "install", "-g", "serve"])
         )
         
-        self.frontend_service = (
+        frontend_service = (
             frontend
-            .with_service_binding("api", self.api_service)
+            .with_service_binding("api", api_service)
             .with_exec(["serve", "-s", "build", "-l", str(frontend_config["port"])])
             .as_service()
             .with_exposed_port(frontend_config["port"])
         )
+        return frontend, frontend_service
+    
+    async def deploy_frontend(self, project_dir):
+        """Deploy the React frontend container"""
+        print("⚛️ Setting up React frontend...")
+        frontend_config = self.config["frontend"]
+        
+        frontend, self.frontend_service = self._build_frontend(project_dir, self.api_service)
+        await self.frontend_service.start()
         
         # Get container ID for host port mapping
         frontend_container = await frontend.with_service_binding("api", self.api_service).with_exposed_port(frontend_config["port"]).publish()
@@ -239,20 +502,117 @@ class DaggerOrchestrator:
         
         return self.frontend_service
     
+    async def wait_for_api_ready(self, api_service):
+        """Poll the API health endpoint until it responds or the readiness timeout expires"""
+        update_config = self.config["api"].get("update", {})
+        timeout = update_config.get("readiness_timeout", 60)
+        interval = update_config.get("readiness_interval", 1)
+        health_image = self._image(self.config.get("healthcheck", {}).get("image", "alpine/curl"))
+        port = self.config["api"]["port"]
+        deadline = time.monotonic() + timeout
+        
+        while time.monotonic() < deadline:
+            try:
+                probe = (
+                    self.client.container()
+                    .from_(health_image)
+                    .with_service_binding("api", api_service)
+                    # Defeat the Dagger cache so every probe really runs
+                    .with_env_variable("PROBE_AT", str(time.time()))
+                    .with_exec(["curl", "-sf", f"http://api:{port}/api/health"])
+                )
+                await probe.stdout()
+                return True
+            except Exception:
+                await asyncio.sleep(interval)
+        return False
+    
+    async def redeploy_api(self):
+        """Replace the API instance behind the host port using the configured update strategy"""
+        update_config = self.config["api"].get("update", {})
+        strategy = update_config.get("strategy", "rolling")
+        drain_seconds = update_config.get("drain_seconds", 10)
+        project_dir = await self.setup_project_directory()
+        old_api_service = self.api_service
+        old_api_tunnel = self.api_tunnel
+        
+        # The frontend is built to call the API through the host port proxy,
+        # so only the proxy upstream has to move
+        if strategy != "rolling":
+            print("♻️ Recreating API instance...")
+            await old_api_tunnel.stop()
+            await old_api_service.stop()
+            _, self.api_service = self._build_api(project_dir)
+            await self.api_service.start()
+            self.api_tunnel, upstream = await self._tunnel_api(self.api_service)
+            self.api_proxy.switch(upstream)
+            print("✅ API instance recreated")
+            return True
+        
+        print("🔄 Rolling update of API instance...")
+        _, new_api_service = self._build_api(project_dir)
+        await new_api_service.start()
+        
+        print("  ⏳ Waiting for new API instance to become ready...")
+        if not await self.wait_for_api_ready(new_api_service):
+            print("  ❌ New API instance never became ready; keeping the current one")
+            await new_api_service.stop()
+            return False
+        
+        new_api_tunnel, upstream = await self._tunnel_api(new_api_service)
+        if upstream == self.api_proxy.upstream:
+            # An identical definition resolves to the running instance and
+            # tunnel, and stopping them would take down the only API instance
+            print("  ⚠️ New API instance is the one already serving; keeping it")
+            return True
+        
+        old_upstream = self.api_proxy.switch(upstream)
+        self.api_service = new_api_service
+        self.api_tunnel = new_api_tunnel
+        print(f"  ✅ Host port {self.api_proxy.port} switched to new API instance")
+        
+        print(f"  ⏳ Draining old API instance (up to {drain_seconds}s)...")
+        if not await self.api_proxy.drain(old_upstream, drain_seconds):
+            print(f"  ⚠️ {self.api_proxy.active[old_upstream]} connection(s) still open after {drain_seconds}s")
+        # Stopping sends SIGTERM; gunicorn finishes any request still in flight
+        await old_api_tunnel.stop()
+        await old_api_service.stop()
+        print("✅ Rolling update complete")
+        return True
+    
+    async def _serve_forever(self):
+        """Keep services running and redeploy the API tier on SIGHUP"""
+        redeploy = asyncio.Event()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, redeploy.set)
+            print(f"🔁 Run 'kill -HUP {os.getpid()}' to redeploy the API tier.")
+        except (NotImplementedError, AttributeError):
+            # Signal handlers are unavailable on Windows event loops
+            pass
+        
+        while True:
+            await redeploy.wait()
+            redeploy.clear()
+            try:
+                await self.redeploy_api()
+            except Exception as e:
+                print(f"❌ API redeploy failed: {str(e)}")
+    
     async def perform_health_checks(self):
         """Perform health checks on all services"""
         print("🔍 Performing health checks...")
         print("  ⏳ Waiting for database to initialize...")
-        # Give the database some time to initialize
-        time.sleep(5)
+        # Give the database some time to initialize without blocking the event loop
+        await asyncio.sleep(self.config.get("healthcheck", {}).get("initial_delay", 5))
         
         # Health check for API using host port
         api_config = self.config["api"]
+        health_image = self._image(self.config.get("healthcheck", {}).get("image", "alpine/curl"))
         try:
             # First try internal service check
             test_api_health = (
                 self.client.container()
-                .from_("alpine/curl")
+                .from_(health_image)
                 .with_service_binding("api", self.api_service)
                 .with_exec(["curl", "-s", "http://api:5000/api/health"])
             )
@@ -261,7 +621,7 @@ class DaggerOrchestrator:
             
             # Then try host port check
             host_check = self.docker_client.containers.run(
-                "alpine/curl", 
+                health_image,
                 f"curl -s http://host.docker.internal:{api_config['host_port']}/api/health",
                 network_mode="host",
                 remove=True
@@ -276,7 +636,7 @@ class DaggerOrchestrator:
         try:
             test_quotes = (
                 self.client.container()
-                .from_("alpine/curl")
+                .from_(health_image)
                 .with_service_binding("api", self.api_service)
                 .with_exec(["curl", "-s", "http://api:5000/api/quotes"])
             )
@@ -289,6 +649,33 @@ class DaggerOrchestrator:
             
         return True
     
+    async def report_query_statistics(self):
+        """Print the most expensive queries recorded by pg_stat_statements"""
+        db_config = self.config["db"]
+        tuning_config = db_config.get("tuning", {})
+        if not tuning_config.get("enabled", False) or not tuning_config.get("pg_stat_statements", True):
+            return
+        
+        print("📊 Top queries by total execution time:")
+        try:
+            report = (
+                self.client.container()
+                .from_(self._image(db_config["image"]))
+                .with_service_binding("db", self.db_service)
+                .with_env_variable("PGPASSWORD", db_config["env"]["POSTGRES_PASSWORD"])
+                # Defeat the Dagger cache so the report reflects this run's statistics
+                .with_env_variable("REPORT_AT", str(time.time()))
+                .with_exec([
+                    "psql", "-h", "db",
+                    "-U", db_config["env"]["POSTGRES_USER"],
+                    "-d", db_config["env"]["POSTGRES_DB"],
+                    "-c", TOP_QUERIES_SQL.format(limit=int(tuning_config.get("top_queries", 10)))
+                ])
+            )
+            print(await report.stdout())
+        except Exception as e:
+            print(f"  ⚠️ Query statistics unavailable: {str(e)}")
+    
     async def export_containers(self):
         """Export containers to Docker registry if configured"""
         if not self.container_ids:
@@ -320,24 +707,37 @@ class DaggerOrchestrator:
             except Exception as e:
                 print(f"  ⚠️ Failed to remove {service} container: {str(e)}")
     
+    async def deploy(self):
+        """Deploy all services and run health checks, returning whether they passed"""
+        # Initialize client
+        await self.initialize_client()
+        
+        # Pull base images up front instead of one at a time during deployment
+        await self.prefetch_images()
+        
+        # Set up project directory
+        project_dir = await self.setup_project_directory()
+        
+        # Deploy all services
+        await self.deploy_database(project_dir)
+        await self.deploy_replicas()
+        await self.deploy_api(project_dir)
+        await self.deploy_frontend(project_dir)
+        
+        # Perform health checks
+        health_checks_passed = await self.perform_health_checks()
+        
+        # Report query statistics gathered during the health checks
+        await self.report_query_statistics()
+        
+        return health_checks_passed
+    
     async def run(self):
         """Run the full orchestration process"""
         print("🚀 Starting Dagger container orchestration...")
         
         try:
-            # Initialize client
-            await self.initialize_client()
-            
-            # Set up project directory
-            project_dir = await self.setup_project_directory()
-            
-            # Deploy all services
-            await self.deploy_database(project_dir)
-            await self.deploy_api(project_dir)
-            await self.deploy_frontend(project_dir)
-            
-            # Perform health checks
-            health_checks_passed = await self.perform_health_checks()
+            health_checks_passed = await self.deploy()
             
             if health_checks_passed:
                 # Print success message with URLs
@@ -347,12 +747,13 @@ class DaggerOrchestrator:
                 print(f"  • API Health: http://localhost:{self.config['api']['host_port']}/api/health")
                 print(f"  • API Quotes: http://localhost:{self.config['api']['host_port']}/api/quotes")
                 print(f"  • Database: localhost:{self.config['db']['host_port']} (postgres/postgres)")
+                if self.replica_services:
+                    print(f"  • Read replicas: {len(self.replica_services)} (serving /api/quotes)")
                 
                 print("\n⏱️ Services will remain running. Press Ctrl+C to stop.")
                 
                 # Keep the services running
-                while True:
-                    await asyncio.sleep(1)
+                await self._serve_forever()
             else:
                 print("\n⚠️ Some health checks failed, but services may still be operational.")
                 print("\n🌐 Try accessing your application at:")
@@ -363,8 +764,7 @@ class DaggerOrchestrator:
                 print("\n⏱️ Services will remain running. Press Ctrl+C to stop.")
                 
                 # Keep the services running despite health check failures
-                while True:
-                    await asyncio.sleep(1)
+                await self._serve_forever()
                 
         except Exception as e:
             print(f"\n❌ Error during orchestration: {str(e)}")
@@ -373,20 +773,24 @@ class DaggerOrchestrator:
             
     async def close(self):
         """Close the Dagger client connection and clean up"""
+        if self.api_proxy:
+            await self.api_proxy.close()
+        
         try:
             await self.cleanup_containers()
         except Exception as e:
             print(f"⚠️ Error during cleanup: {str(e)}")
             
-        if self.client:
-            await self.client.__aexit__(None, None, None)
+        if self.connection:
+            await self.connection.__aexit__(None, None, None)
 
 async def main():
     parser = argparse.ArgumentParser(description="Dagger Container Orchestrator")
     parser.add_argument("--project-dir", default=".", help="Project directory path")
+    parser.add_argument("--update-lock", action="store_true", help="Resolve base image tags and write their digests to the image lockfile")
     args = parser.parse_args()
     
-    orchestrator = DaggerOrchestrator(args.project_dir)
+    orchestrator = DaggerOrchestrator(args.project_dir, update_lock=args.update_lock)
     try:
         await orchestrator.run()
     finally:
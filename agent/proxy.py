@@ -0,0 +1,89 @@
+"""
+Switchable TCP proxy that owns the API host port during rolling updates.
+"""
+
+import asyncio
+from collections import Counter
+from typing import Optional, Tuple
+
+Upstream = Tuple[str, int]
+
+
+def parse_endpoint(endpoint: str) -> Upstream:
+    """Split a 'host:port' endpoint, as returned by Dagger tunnels, into an upstream"""
+    host, port = endpoint.split("://")[-1].rsplit(":", 1)
+    return host, int(port)
+
+
+class ApiProxy:
+    """
+    Forwards connections on a fixed host port to the current API instance.
+
+    Each connection stays pinned to the upstream it was accepted for, so
+    switching upstreams sends new connections to the new instance while the
+    old one finishes the requests already in flight.
+    """
+
+    def __init__(self, port: int, upstream: Upstream, host: str = "0.0.0.0"):
+        self.host = host
+        self.port = port
+        self.upstream = upstream
+        self.active = Counter()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Report the real port when an ephemeral one (0) was requested
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def switch(self, upstream: Upstream) -> Upstream:
+        """Send new connections to `upstream` and return the previous one"""
+        previous, self.upstream = self.upstream, upstream
+        return previous
+
+    async def drain(self, upstream: Upstream, timeout: float) -> bool:
+        """Wait until no connections to `upstream` remain, returning False on timeout"""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while self.active[upstream] > 0:
+            if asyncio.get_running_loop().time() >= deadline:
+                return False
+            await asyncio.sleep(0.1)
+        return True
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, client_reader, client_writer):
+        upstream = self.upstream
+        self.active[upstream] += 1
+        upstream_writer = None
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(*upstream)
+            await asyncio.gather(
+                self._pipe(client_reader, upstream_writer),
+                self._pipe(upstream_reader, client_writer),
+            )
+        except OSError:
+            pass
+        finally:
+            self.active[upstream] -= 1
+            for writer in (client_writer, upstream_writer):
+                if writer is not None:
+                    writer.close()
+
+    @staticmethod
+    async def _pipe(reader, writer):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+            if writer.can_write_eof():
+                writer.write_eof()
+        except OSError:
+            pass
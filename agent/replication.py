@@ -0,0 +1,58 @@
+"""
+PostgreSQL streaming replication helpers for read replicas of the db service.
+"""
+
+import shlex
+from typing import Dict, List
+
+REPLICA_HOST_PREFIX = "db-replica"
+
+
+def replica_host(index: int) -> str:
+    """Service binding hostname for the replica at the given index"""
+    return f"{REPLICA_HOST_PREFIX}-{index}"
+
+
+def replica_slot(index: int) -> str:
+    """Physical replication slot that keeps the WAL the replica at the given index needs"""
+    return f"db_replica_{index}"
+
+
+def primary_settings(replica_count: int) -> Dict[str, str]:
+    """Settings the primary needs to stream WAL to its replicas"""
+    return {
+        "wal_level": "replica",
+        "max_wal_senders": str(replica_count + 2),
+        "max_replication_slots": str(replica_count + 2),
+        "hot_standby": "on",
+    }
+
+
+def primary_init_script(user: str, password: str) -> str:
+    """Init script that creates the replication role and allows it in pg_hba.conf"""
+    return f"""#!/bin/sh
+set -e
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<EOSQL
+    CREATE ROLE {user} WITH REPLICATION LOGIN PASSWORD '{password}';
+EOSQL
+echo "host replication {user} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
+"""
+
+
+def replica_command(index: int, user: str, port: int, server_args: List[str]) -> List[str]:
+    """Command that clones the primary with pg_basebackup and starts a hot standby
+
+    The clone creates the replica's own replication slot, so the primary keeps
+    the WAL it needs and each replica has a distinct service definition; Dagger
+    would otherwise run a single instance for all identically defined replicas.
+    A retry after the slot was created reuses it instead of failing to create it.
+    """
+    basebackup = f'pg_basebackup -h db -p {port} -U {user} -D "$PGDATA" -R -X stream -S {replica_slot(index)}'
+    script = (
+        f'until {basebackup} -C || {{ rm -rf "$PGDATA"/*; {basebackup}; }}; do '
+        'rm -rf "$PGDATA"/*; sleep 1; '
+        'done; '
+        'chmod 700 "$PGDATA"; '
+        f"exec {shlex.join(server_args)}"
+    )
+    return ["sh", "-c", script]
@@ -0,0 +1,45 @@
+"""
+Service binding behaviour of the benchmark fakes.
+"""
+
+import asyncio
+
+import fakes
+
+
+def test_bound_services_start_once_when_pipeline_runs():
+    engine = fakes.FakeEngine(fakes.Latencies(pull=0, build=0, publish=0, health=0, start=0, stop=0))
+    client = fakes.FakeClient(engine)
+    db = client.container().from_("postgres").as_service()
+    replica = client.container().from_("postgres").with_service_binding("db", db).with_exec(["postgres"]).as_service()
+    api = (
+        client.container()
+        .from_("python")
+        .with_service_binding("db", db)
+        .with_service_binding("db-replica-0", replica)
+        .with_exec(["gunicorn"])
+    )
+
+    assert engine.counts["service_start"] == 0
+    asyncio.run(api.sync())
+    # db is bound to both the API and the replica but starts only once
+    assert engine.counts["service_start"] == 2
+
+
+def test_identical_service_definitions_share_one_instance():
+    engine = fakes.FakeEngine(fakes.Latencies(pull=0, build=0, publish=0, health=0, start=0, stop=0))
+    client = fakes.FakeClient(engine)
+
+    def replica(name):
+        return client.container().from_("postgres").with_exec(["postgres", name]).as_service()
+
+    first, same, other = replica("a"), replica("a"), replica("b")
+
+    async def scenario():
+        await asyncio.gather(first.start(), same.start(), other.start())
+        started = engine.counts["service_start"]
+        # Stopping either handle stops the shared instance
+        await same.stop()
+        return started, engine.is_running(first), engine.is_running(other)
+
+    assert asyncio.run(scenario()) == (2, False, True)
@@ -0,0 +1,90 @@
+"""
+Image lockfile round-trip, using the fake registry from fakes.py as a local registry stand-in.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+
+import benchmark
+import fakes
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _install_fakes(main):
+    latencies = fakes.Latencies(pull=0, build=0, publish=0, health=0, start=0, stop=0, docker_api=0)
+    engine = fakes.FakeEngine(latencies)
+    main.dagger = fakes.dagger_module(engine)
+    main.docker = fakes.docker_module(latencies, engine.registry)
+    return engine
+
+
+async def _prefetch(main, lock_path, update_lock):
+    orchestrator = main.DaggerOrchestrator(PROJECT_DIR, update_lock=update_lock)
+    orchestrator.config.setdefault("prefetch", {})["lockfile"] = str(lock_path)
+    orchestrator.image_lock = orchestrator._load_image_lock()
+    await orchestrator.initialize_client()
+    pinned = await orchestrator.prefetch_images()
+    return orchestrator, pinned
+
+
+def test_lockfile_round_trip_resolves_from_local_cache(tmp_path):
+    main = benchmark.load_orchestrator_module()
+    engine = _install_fakes(main)
+    lock_path = tmp_path / "images.lock.json"
+
+    async def scenario():
+        first, pinned = await _prefetch(main, lock_path, update_lock=True)
+        contacts = engine.registry.contacts
+        second, repinned = await _prefetch(main, lock_path, update_lock=False)
+        return first, pinned, contacts, second, repinned
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        first, pinned, contacts, second, repinned = asyncio.run(scenario())
+
+    locked = json.loads(lock_path.read_text())
+    assert locked == pinned
+    assert set(locked) == set(first._base_images())
+    assert all("@sha256:" in ref for ref in locked.values())
+
+    # The second run deploys from the pinned digests without touching the registry
+    assert second.image_lock == locked
+    assert repinned == locked
+    assert engine.registry.contacts == contacts
+    assert second._image(first.config["db"]["image"]) == locked[first.config["db"]["image"]]
+
+
+def test_lockfile_defaults_to_agent_directory():
+    main = benchmark.load_orchestrator_module()
+    _install_fakes(main)
+    with contextlib.redirect_stdout(io.StringIO()):
+        orchestrator = main.DaggerOrchestrator(PROJECT_DIR)
+    agent_dir = os.path.dirname(os.path.abspath(main.__file__))
+    assert orchestrator._lockfile_path() == os.path.join(agent_dir, "images.lock.json")
+
+
+def test_failed_pull_leaves_lockfile_unchanged(tmp_path):
+    main = benchmark.load_orchestrator_module()
+    engine = _install_fakes(main)
+    lock_path = tmp_path / "images.lock.json"
+
+    async def scenario():
+        await _prefetch(main, lock_path, update_lock=True)
+        locked = lock_path.read_text()
+        engine.registry.unavailable.add("node:20-alpine")
+        # A fresh engine cache, so the update has to contact the registry again
+        engine.pulls.clear()
+        try:
+            await _prefetch(main, lock_path, update_lock=True)
+        except RuntimeError as e:
+            return locked, str(e)
+        return locked, None
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        locked, error = asyncio.run(scenario())
+
+    assert error is not None and "node:20-alpine" in error
+    assert lock_path.read_text() == locked
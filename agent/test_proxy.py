@@ -0,0 +1,79 @@
+"""
+ApiProxy switching and draining under live traffic, using local asyncio upstreams.
+"""
+
+import asyncio
+
+from proxy import ApiProxy, parse_endpoint
+
+
+async def _upstream(name: str, delay: float):
+    """Minimal HTTP server that answers every request with its name after `delay`"""
+
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        await asyncio.sleep(delay)
+        body = name.encode()
+        writer.write(b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, ("127.0.0.1", server.sockets[0].getsockname()[1])
+
+
+async def _request(port: int) -> str:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /api/health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    assert response.startswith(b"HTTP/1.1 200"), response
+    return response.rsplit(b"\r\n\r\n", 1)[1].decode()
+
+
+def test_parse_endpoint():
+    assert parse_endpoint("localhost:49152") == ("localhost", 49152)
+    assert parse_endpoint("tcp://127.0.0.1:5000") == ("127.0.0.1", 5000)
+
+
+def test_switch_moves_new_connections_and_drains_old_ones():
+    async def scenario():
+        blue, blue_upstream = await _upstream("blue", delay=0.2)
+        green, green_upstream = await _upstream("green", delay=0.0)
+        proxy = ApiProxy(0, blue_upstream, host="127.0.0.1")
+        await proxy.start()
+        try:
+            # Requests in flight on blue when traffic moves to green
+            in_flight = [asyncio.ensure_future(_request(proxy.port)) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            assert proxy.switch(green_upstream) == blue_upstream
+            after = await asyncio.gather(*(_request(proxy.port) for _ in range(5)))
+            assert await proxy.drain(blue_upstream, timeout=2)
+            return await asyncio.gather(*in_flight), after
+        finally:
+            await proxy.close()
+            blue.close()
+            green.close()
+
+    before, after = asyncio.run(scenario())
+    assert before == ["blue"] * 5
+    assert after == ["green"] * 5
+
+
+def test_drain_times_out_while_connections_remain():
+    async def scenario():
+        slow, slow_upstream = await _upstream("slow", delay=1.0)
+        proxy = ApiProxy(0, slow_upstream, host="127.0.0.1")
+        await proxy.start()
+        try:
+            request = asyncio.ensure_future(_request(proxy.port))
+            await asyncio.sleep(0.05)
+            drained = await proxy.drain(slow_upstream, timeout=0.2)
+            await request
+            return drained
+        finally:
+            await proxy.close()
+            slow.close()
+
+    assert asyncio.run(scenario()) is False
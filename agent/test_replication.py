@@ -0,0 +1,45 @@
+"""
+Read replica definitions, checked against the Dagger fakes from fakes.py.
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+
+import benchmark
+import fakes
+from replication import replica_command, replica_slot
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_replica_command_uses_its_own_slot():
+    first = replica_command(0, "replicator", 5432, ["postgres"])
+    second = replica_command(1, "replicator", 5432, ["postgres"])
+    assert first != second
+    assert f"-S {replica_slot(0)} -C" in first[-1]
+    assert f"-S {replica_slot(1)} -C" in second[-1]
+
+
+def test_replicas_have_distinct_definitions():
+    main = benchmark.load_orchestrator_module()
+    engine = fakes.FakeEngine(fakes.Latencies(pull=0, build=0, publish=0, health=0, start=0, stop=0, docker_api=0))
+    main.dagger = fakes.dagger_module(engine)
+    main.docker = fakes.docker_module(engine.latencies, engine.registry)
+
+    async def scenario():
+        orchestrator = main.DaggerOrchestrator(PROJECT_DIR)
+        orchestrator.config["db"]["replicas"]["count"] = 3
+        await orchestrator.initialize_client()
+        orchestrator.db_service = orchestrator.client.container().from_("postgres").as_service()
+        replicas = await orchestrator.deploy_replicas()
+        await asyncio.gather(*(replica.start() for replica in replicas))
+        return replicas
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        replicas = asyncio.run(scenario())
+
+    # Dagger runs one instance per definition, so identical replicas would collapse into one
+    assert len({replica.key for replica in replicas}) == 3
+    assert engine.counts["service_start"] == 4
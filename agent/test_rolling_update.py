@@ -0,0 +1,69 @@
+"""
+Rolling API updates against the Dagger fakes, which run one instance per service definition.
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+
+import benchmark
+import fakes
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _orchestrator():
+    main = benchmark.load_orchestrator_module()
+    engine = fakes.FakeEngine(fakes.Latencies(pull=0, build=0, publish=0, health=0, start=0, stop=0, docker_api=0))
+    main.dagger = fakes.dagger_module(engine)
+    main.docker = fakes.docker_module(engine.latencies, engine.registry)
+    orchestrator = main.DaggerOrchestrator(PROJECT_DIR)
+    orchestrator.config["healthcheck"]["initial_delay"] = 0
+    orchestrator.config["api"]["host_port"] = 0
+    orchestrator.config["api"]["update"]["drain_seconds"] = 0
+    return engine, orchestrator
+
+
+def _run(scenario):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(scenario())
+
+
+def test_rolling_update_of_unchanged_api_keeps_an_instance_serving():
+    engine, orchestrator = _orchestrator()
+
+    async def scenario():
+        await orchestrator.deploy()
+        try:
+            old_service, old_upstream = orchestrator.api_service, orchestrator.api_proxy.upstream
+            assert await orchestrator.redeploy_api()
+            return old_service, old_upstream
+        finally:
+            await orchestrator.close()
+
+    old_service, old_upstream = _run(scenario)
+    # Each deploy gets its own definition, so the update really replaces the instance
+    assert orchestrator.api_service.key != old_service.key
+    assert orchestrator.api_proxy.upstream != old_upstream
+    assert engine.is_running(orchestrator.api_service)
+    assert not engine.is_running(old_service)
+
+
+def test_rolling_update_onto_the_running_instance_stops_nothing():
+    engine, orchestrator = _orchestrator()
+
+    async def scenario():
+        await orchestrator.deploy()
+        try:
+            running = orchestrator.api_service
+            # Simulate a build that resolves to the definition already serving
+            orchestrator._build_api = lambda project_dir: (None, running)
+            assert await orchestrator.redeploy_api()
+            return running
+        finally:
+            await orchestrator.close()
+
+    running = _run(scenario)
+    assert orchestrator.api_service is running
+    assert engine.is_running(running)
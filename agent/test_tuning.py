@@ -0,0 +1,65 @@
+"""
+Postgres settings derived from the database's memory and CPUs.
+"""
+
+from tuning import (
+    EPHEMERAL_SETTINGS,
+    GB,
+    MB,
+    build_postgres_settings,
+    format_size,
+    settings_to_args,
+)
+
+
+def test_format_size_picks_the_largest_exact_unit():
+    assert format_size(2 * GB) == "2GB"
+    assert format_size(GB + 512 * MB) == "1536MB"
+    assert format_size(256 * MB + 100) == "256MB"
+    assert format_size(600 * 1024) == "600kB"
+    # Below PostgreSQL's work_mem minimum of 64kB
+    assert format_size(1024) == "64kB"
+
+
+def test_settings_scale_with_memory_and_cpus():
+    settings = build_postgres_settings({}, 8 * GB, 8)
+    assert settings["shared_buffers"] == "2GB"
+    assert settings["effective_cache_size"] == "6GB"
+    assert settings["maintenance_work_mem"] == "512MB"
+    assert settings["work_mem"] == "5MB"
+    assert settings["wal_buffers"] == "16MB"
+    assert settings["max_worker_processes"] == "8"
+    assert settings["max_parallel_workers_per_gather"] == "4"
+    assert settings["shared_preload_libraries"] == "pg_stat_statements"
+
+
+def test_small_instances_get_work_mem_in_kb():
+    settings = build_postgres_settings({}, 256 * MB, 1)
+    assert settings["shared_buffers"] == "64MB"
+    assert settings["work_mem"] == "655kB"
+    assert settings["wal_buffers"] == "1MB"
+    assert settings["max_parallel_workers_per_gather"] == "1"
+
+
+def test_ephemeral_profile_trades_durability_for_speed():
+    settings = build_postgres_settings({"profile": "ephemeral"}, GB, 2)
+    for key, value in EPHEMERAL_SETTINGS.items():
+        assert settings[key] == value
+    assert "fsync" not in build_postgres_settings({}, GB, 2)
+
+
+def test_explicit_settings_override_derived_ones():
+    tuning = {
+        "profile": "ephemeral",
+        "pg_stat_statements": False,
+        "settings": {"shared_buffers": "1GB", "fsync": "on", "jit": False},
+    }
+    settings = build_postgres_settings(tuning, 4 * GB, 4)
+    assert settings["shared_buffers"] == "1GB"
+    assert settings["fsync"] == "on"
+    assert settings["jit"] == "False"
+    assert "shared_preload_libraries" not in settings
+
+
+def test_settings_to_args():
+    assert settings_to_args({"fsync": "off", "work_mem": "4MB"}) == ["postgres", "-c", "fsync=off", "-c", "work_mem=4MB"]
@@ -0,0 +1,94 @@
+"""
+PostgreSQL performance tuning derived from the database container's resources.
+"""
+
+from typing import Dict, List
+
+MB = 1024 * 1024
+GB = 1024 * MB
+
+# Settings that trade crash safety for write speed. Only suitable for
+# throwaway preview stacks whose data can be recreated from db/init.sql.
+EPHEMERAL_SETTINGS = {
+    "fsync": "off",
+    "synchronous_commit": "off",
+    "full_page_writes": "off",
+    "wal_level": "minimal",
+    "max_wal_senders": "0",
+    "checkpoint_timeout": "30min",
+}
+
+TOP_QUERIES_SQL = """
+SELECT calls,
+       round(total_exec_time::numeric, 2) AS total_ms,
+       round(mean_exec_time::numeric, 2) AS mean_ms,
+       rows,
+       left(regexp_replace(query, '\\s+', ' ', 'g'), 80) AS query
+FROM pg_stat_statements
+ORDER BY total_exec_time DESC
+LIMIT {limit};
+"""
+
+PG_STAT_STATEMENTS_INIT_SQL = "CREATE EXTENSION IF NOT EXISTS pg_stat_statements;\n"
+
+
+def format_size(size_bytes: int) -> str:
+    """Format a byte count using the largest unit PostgreSQL accepts exactly"""
+    if size_bytes >= GB and size_bytes % GB == 0:
+        return f"{size_bytes // GB}GB"
+    if size_bytes >= MB:
+        return f"{size_bytes // MB}MB"
+    return f"{max(size_bytes // 1024, 64)}kB"
+
+
+def build_postgres_settings(tuning_config: Dict, memory_bytes: int, cpus: int) -> Dict[str, str]:
+    """Derive server settings from the memory and CPUs available to the database"""
+    cpus = max(int(cpus), 1)
+    max_connections = int(tuning_config.get("max_connections", 100))
+    parallel_per_gather = max(1, min(4, cpus // 2))
+
+    shared_buffers = memory_bytes // 4
+    work_mem = (memory_bytes - shared_buffers) // (max_connections * 3) // parallel_per_gather
+    wal_buffers = min(shared_buffers * 3 // 100, 16 * MB)
+    if wal_buffers > 14 * MB:
+        wal_buffers = 16 * MB
+
+    settings = {
+        "max_connections": str(max_connections),
+        "shared_buffers": format_size(shared_buffers),
+        "effective_cache_size": format_size(memory_bytes * 3 // 4),
+        "maintenance_work_mem": format_size(min(memory_bytes // 16, 2 * GB)),
+        "work_mem": format_size(work_mem),
+        "wal_buffers": format_size(wal_buffers),
+        "min_wal_size": "1GB",
+        "max_wal_size": "4GB",
+        "checkpoint_completion_target": "0.9",
+        "random_page_cost": "1.1",
+        "effective_io_concurrency": "200",
+        "max_worker_processes": str(cpus),
+        "max_parallel_workers": str(cpus),
+        "max_parallel_workers_per_gather": str(parallel_per_gather),
+        "max_parallel_maintenance_workers": str(parallel_per_gather),
+    }
+
+    if tuning_config.get("profile") == "ephemeral":
+        settings.update(EPHEMERAL_SETTINGS)
+
+    if tuning_config.get("pg_stat_statements", True):
+        settings["shared_preload_libraries"] = "pg_stat_statements"
+        settings["pg_stat_statements.track"] = "top"
+        settings["pg_stat_statements.max"] = "10000"
+
+    # Explicit settings from config.json always win
+    for key, value in tuning_config.get("settings", {}).items():
+        settings[key] = str(value)
+
+    return settings
+
+
+def settings_to_args(settings: Dict[str, str]) -> List[str]:
+    """Convert a settings mapping into postgres command-line arguments"""
+    args = ["postgres"]
+    for key, value in settings.items():
+        args.extend(["-c", f"{key}={value}"])
+    return args
@@ -1,3 +1,7 @@
+import itertools
+import os
+import time
+
 from flask import Flask, jsonify
 import psycopg2
 from flask_cors import CORS
@@ -5,13 +9,67 @@ from flask_cors import CORS
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+DATABASE_URL = os.environ.get("DATABASE_URL", "postgresql://postgres:postgres@db:5432/postgres")
+REPLICA_URLS = [url for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url]
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_HEALTH_TTL_SECONDS = float(os.environ.get("REPLICA_HEALTH_TTL_SECONDS", "1"))
+
+# Seconds the replica is behind the primary, or NULL when it is not streaming.
+# Receive and replay LSNs also match on a replica cut off from the primary, so
+# the equal-LSN shortcut only applies while the WAL receiver is streaming.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END;
+"""
+
+_replica_cycle = itertools.cycle(REPLICA_URLS)
+# Replica URL -> (monotonic time of last check, whether it was usable)
+_replica_health = {}
+
 def get_db_connection():
-    return psycopg2.connect(
-        host="db",
-        dbname="postgres",
-        user="postgres",
-        password="postgres"
-    )
+    return psycopg2.connect(DATABASE_URL)
+
+def _replica_within_lag(conn):
+    cur = conn.cursor()
+    cur.execute(REPLICA_LAG_SQL)
+    lag = cur.fetchone()[0]
+    cur.close()
+    return lag is not None and lag <= REPLICA_MAX_LAG_SECONDS
+
+def get_read_connection():
+    """Connect to the next healthy replica, falling back to the primary.
+
+    Replica health is probed at most once per REPLICA_HEALTH_TTL_SECONDS, so
+    most reads cost a single connection and no extra query. Read-only routes
+    should use this so they scale with the number of replicas.
+    """
+    now = time.monotonic()
+    for _ in range(len(REPLICA_URLS)):
+        url = next(_replica_cycle)
+        checked_at, healthy = _replica_health.get(url, (None, False))
+        fresh = checked_at is not None and now - checked_at < REPLICA_HEALTH_TTL_SECONDS
+        if fresh and not healthy:
+            continue
+        try:
+            conn = psycopg2.connect(url, connect_timeout=2)
+        except psycopg2.Error:
+            _replica_health[url] = (now, False)
+            continue
+        if fresh:
+            return conn
+        try:
+            healthy = _replica_within_lag(conn)
+        except psycopg2.Error:
+            healthy = False
+        _replica_health[url] = (now, healthy)
+        if healthy:
+            return conn
+        conn.close()
+    return get_db_connection()
 
 @app.route('/api/health')
 def health():
@@ -24,7 +82,7 @@ def health():
 
 @app.route('/api/quotes')
 def get_quotes():
-    conn = get_db_connection()
+    conn = get_read_connection()
     cur = conn.cursor()
     cur.execute("SELECT id, quote, author FROM quotes;")
     quotes = cur.fetchall()
@@ -33,4 +91,4 @@ def get_quotes():
     return jsonify([{'id': q[0], 'quote': q[1], 'author': q[2]} for q in quotes])
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000, debug=True)
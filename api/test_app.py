@@ -0,0 +1,123 @@
+"""
+Read routing in get_read_connection, with psycopg2.connect and the clock stubbed.
+"""
+
+import itertools
+
+import pytest
+
+pytest.importorskip("flask")
+psycopg2 = pytest.importorskip("psycopg2")
+
+import app
+
+PRIMARY = "postgresql://primary"
+REPLICAS = ["postgresql://replica-0", "postgresql://replica-1"]
+
+
+class FakeConnection:
+    def __init__(self, url, lag):
+        self.url = url
+        self.lag = lag
+        self.queries = 0
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql):
+        self.queries += 1
+
+    def fetchone(self):
+        return (self.lag,)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Replicas whose lag (None when not streaming) or unreachability each test sets"""
+    state = {"now": 100.0, "lag": {url: 0 for url in REPLICAS}, "down": set(), "connects": []}
+
+    def connect(url, **kwargs):
+        state["connects"].append(url)
+        if url in state["down"]:
+            raise psycopg2.OperationalError(f"could not connect to {url}")
+        return FakeConnection(url, state["lag"].get(url, 0))
+
+    monkeypatch.setattr(app, "DATABASE_URL", PRIMARY)
+    monkeypatch.setattr(app, "REPLICA_URLS", REPLICAS)
+    monkeypatch.setattr(app, "REPLICA_MAX_LAG_SECONDS", 5.0)
+    monkeypatch.setattr(app, "REPLICA_HEALTH_TTL_SECONDS", 1.0)
+    monkeypatch.setattr(app, "_replica_cycle", itertools.cycle(REPLICAS))
+    monkeypatch.setattr(app, "_replica_health", {})
+    monkeypatch.setattr(app.psycopg2, "connect", connect)
+    monkeypatch.setattr(app.time, "monotonic", lambda: state["now"])
+    return state
+
+
+def test_reads_rotate_through_healthy_replicas(db):
+    assert [app.get_read_connection().url for _ in range(3)] == [REPLICAS[0], REPLICAS[1], REPLICAS[0]]
+
+
+def test_health_is_cached_for_the_ttl(db):
+    first = app.get_read_connection()
+    app.get_read_connection()
+    cached = app.get_read_connection()
+    assert first.queries == 1
+    # Within the TTL a known-good replica is used without a lag query
+    assert cached.url == REPLICAS[0] and cached.queries == 0
+
+    db["now"] += 1.0
+    assert app.get_read_connection().queries == 1
+
+
+def test_lagging_replica_is_skipped(db):
+    db["lag"][REPLICAS[0]] = 30
+    assert app.get_read_connection().url == REPLICAS[1]
+    # The lagging replica stays skipped, without reconnecting, until its check expires
+    db["connects"].clear()
+    assert app.get_read_connection().url == REPLICAS[1]
+    assert db["connects"] == [REPLICAS[1]]
+
+
+def test_replica_not_streaming_is_skipped(db):
+    db["lag"] = {url: None for url in REPLICAS}
+    assert app.get_read_connection().url == PRIMARY
+    assert all(app._replica_health[url][1] is False for url in REPLICAS)
+
+
+def test_unreachable_replicas_fall_back_to_primary(db):
+    db["down"] = set(REPLICAS)
+    assert app.get_read_connection().url == PRIMARY
+
+    db["down"].clear()
+    db["connects"].clear()
+    assert app.get_read_connection().url == PRIMARY
+    assert db["connects"] == [PRIMARY]
+
+    # Once the failed checks expire the recovered replicas are used again
+    db["now"] += 1.0
+    assert app.get_read_connection().url in REPLICAS
+
+
+def test_unhealthy_replica_connection_is_closed(db, monkeypatch):
+    db["lag"][REPLICAS[0]] = None
+    db["lag"][REPLICAS[1]] = 30
+    opened = []
+    connect = app.psycopg2.connect
+
+    def tracking_connect(url, **kwargs):
+        conn = connect(url, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(app.psycopg2, "connect", tracking_connect)
+    assert app.get_read_connection().url == PRIMARY
+    assert [conn.closed for conn in opened] == [True, True, False]
+
+
+def test_no_replicas_reads_from_primary(db, monkeypatch):
+    monkeypatch.setattr(app, "REPLICA_URLS", [])
+    assert app.get_read_connection().url == PRIMARY
@@ -1,5 +1,8 @@
 import React, { useState } from 'react';
 
+// Base URL of the API; empty means same origin (e.g. the dev server proxy)
+const API_URL = process.env.REACT_APP_API_URL || '';
+
 export default function App() {
   const [quotes, setQuotes] = useState([]);
   const [loading, setLoading] = useState(false);
@@ -9,7 +12,7 @@ export default function App() {
     setLoading(true);
     setError(null);
     try {
-      const res = await fetch('/api/quotes');
+      const res = await fetch(`${API_URL}/api/quotes`);
       if (!res.ok) {
         throw new Error(`HTTP error! Status: ${res.status}`);
       }
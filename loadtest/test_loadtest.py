@@ -0,0 +1,79 @@
+"""
+Statistics, stage parsing and baseline comparison of the load generator.
+"""
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from loadtest import Stage, compare, parse_stages, percentile, summarize
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(i) for i in range(1, 151)]
+    assert percentile(values, 99) == 149.0
+    assert percentile(values, 50) == 75.0
+    assert percentile(values, 100) == 150.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0) == 1.0
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_counts_dropped_requests_as_errors_only():
+    stats = summarize([0.2, 0.1, 0.3], errors=1, dropped=2, elapsed=1.5)
+    assert stats["requests"] == 5
+    assert stats["dropped"] == 2
+    assert stats["error_rate"] == pytest.approx(3 / 5)
+    # Throughput and latencies come from completed requests alone
+    assert stats["throughput_rps"] == pytest.approx(2.0)
+    assert stats["p50_ms"] == pytest.approx(200)
+    assert stats["max_ms"] == pytest.approx(300)
+
+
+def test_summarize_with_only_dropped_requests():
+    stats = summarize([], errors=0, dropped=4, elapsed=1.0)
+    assert stats["error_rate"] == 1.0
+    assert stats["p99_ms"] == 0.0
+
+
+def test_parse_stages():
+    assert parse_stages("10:30,50:60", "closed") == [Stage(10, 30), Stage(50, 60)]
+    assert parse_stages("2.5:10", "open") == [Stage(2.5, 10)]
+
+
+@pytest.mark.parametrize("spec, mode", [
+    ("0:10", "open"),
+    ("0:10", "closed"),
+    ("-5:10", "open"),
+    ("10:0", "closed"),
+    ("2.5:10", "closed"),
+    ("10", "closed"),
+    ("10:20:30", "open"),
+    ("ten:20", "open"),
+])
+def test_parse_stages_rejects_stages_the_mode_cannot_run(spec, mode):
+    with pytest.raises(ValueError):
+        parse_stages(spec, mode)
+
+
+def _results(*stages):
+    return {"stages": [
+        {"load": load, "endpoints": {"all": {"p99_ms": p99, "throughput_rps": rps, "error_rate": errors}}}
+        for load, p99, rps, errors in stages
+    ]}
+
+
+def test_compare_flags_regressions_beyond_tolerance(capsys):
+    baseline = _results((10, 100.0, 500.0, 0.0), (50, 200.0, 900.0, 0.0))
+    current = _results((10, 115.0, 450.0, 0.005), (50, 260.0, 600.0, 0.05))
+    assert compare(current, baseline, tolerance=20) == [
+        "stage 2 p99_ms", "stage 2 throughput_rps", "stage 2 error_rate",
+    ]
+    assert "different stages" not in capsys.readouterr().out
+
+
+def test_compare_warns_about_different_stages(capsys):
+    baseline = _results((10, 100.0, 500.0, 0.0))
+    current = _results((20, 100.0, 500.0, 0.0))
+    assert compare(current, baseline, tolerance=20) == []
+    assert "different stages" in capsys.readouterr().out